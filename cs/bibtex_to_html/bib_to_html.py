@@ -12,7 +12,7 @@
 #       "note" field enclosed by parentheses ( e.g., note = {(Short note)} )
 #   -   Url to the paper must be saved in the field "url", clearly
 #   -   If you want to display additional links right after the title, you can add fields
-#       named "url_2", "url_3", ... containing the urls, up to a total of 30. You can set
+#       named "url_2", "url_3", ... containing the urls (as many as you want). You can set
 #       the link text by using the optional fields "url_note_2", "url_note_3", ...,
 #       otherwise the links are displayed with a default text.
 #       Note: these additional fields are not BibTex fields, but you can add them to
@@ -21,9 +21,67 @@
 # Please set the variables SCRIPT_DIR, INPUT_BIB, and OUTPUT_HTML below.
 ###########################################################################################
 
-import bibtexparser
-from bibtexparser.customization import convert_to_unicode
-from bibtexparser.bparser import BibTexParser
+import codecs
+import re
+
+import latexcodec # Registers the 'ulatex' codec used in _latex_to_unicode
+from pybtex.database import parse_file
+
+# All text rewrites (-- to en-dash, HTML escaping) done in one regex pass
+_BIB_SUBS = re.compile(r'--|[<>&"]')
+_BIB_MAP = {'--': '–', '<': '&lt;', '>': '&gt;', '&': '&amp;', '"': '&quot;'}
+
+# Template of a single entry: one shared string parsed by .format_map at call
+# time, instead of an f-string the interpreter rebuilds on every entry
+_ENTRY_TMPL = """
+<li>
+<p>{authors} ({year}).
+<br>
+<a href="{link}" class="external">{title}</a>{extra_links}{note_html}{container_html}</p>
+</li>"""
+
+# Static scaffold of the output page: built once at import, written verbatim
+_HTML_HEADER = """<!DOCTYPE html>
+<html lang="it">
+<head>
+    <meta charset="UTF-8">
+    <title>Converted bibliography</title>
+    <style>
+        /* Minimal styles */
+        li {
+            margin-bottom: 1em;
+        }
+        .external {
+            text-decoration: none;
+        }
+    </style>
+</head>
+<body>
+    <h1>References</h1>
+    <ul>
+"""
+
+_HTML_FOOTER = """
+    </ul>
+</body>
+</html>"""
+
+def _escape_bib(value):
+    """
+    Replaces -- with an en-dash and escapes HTML special characters,
+    scanning the string once instead of once per substitution.
+    """
+    return _BIB_SUBS.sub(lambda match: _BIB_MAP[match.group(0)], value)
+
+def _latex_to_unicode(value):
+    """
+    Converts LaTeX escapes to unicode (e.g. {\\'e} -> é) and drops grouping braces.
+    Plain values (the common case) are returned as-is without a decoding pass.
+    """
+    if '\\' in value or '{' in value:
+        value = codecs.decode(value, 'ulatex')
+        return value.replace('{', '').replace('}', '')
+    return value
 
 def get_author_string(entry):
     """
@@ -31,7 +89,7 @@ def get_author_string(entry):
     Outputs an empty string if there are no authors.
     """
     if 'author' in entry:
-        # The library bibtexparser separa gli autori con 'and'
+        # Gli autori sono separati con 'and', come nel file .bib
         authors = entry['author'].split(' and ')
         
         # Formats autors (we use last name only)
@@ -62,8 +120,8 @@ def format_bibtex_entry(entry):
     Formats a single BibTeX entry into the desired HTML format.
     """
     # Extract key fields (we use .get to avoid errors in case a field is missing)
-    title = entry.get('title', 'Unknown title')
-    author_str = get_author_string(entry)
+    title = _escape_bib(entry.get('title', 'Unknown title'))
+    authors = _escape_bib(entry.get('_authors_html', '')) # Precomputed at load time
     year = entry.get('year', 'n.d.') # n.d. = not dated
     
     # Try to extract a URL/Link
@@ -77,56 +135,57 @@ def format_bibtex_entry(entry):
     
     # Field for the custom note
     # We only display the note if it's enclosed by parentheses in the 'note' field
+    # (the field is looked up once instead of once per check)
     custom_note = ""
-    if entry.get('note', '').startswith('(') and entry.get('note', '').endswith(')'):
+    note = entry.get('note', '')
+    if note.startswith('(') and note.endswith(')'):
         # We extract the note without parentheses (I will put them back later cause I like them, but this will allow easier script customization)
-        custom_note = entry['note'].strip()
-    
+        custom_note = note.strip()
+
     # Journal/Booktitle/Proceedings
+    # Single .get per field, instead of an 'in' test followed by a second lookup
     container = ""
     volume = ""
     pages = ""
-    
-    if 'journal' in entry:
-        container = f"<em>{entry['journal']}</em>"
-    elif 'booktitle' in entry:
-        container = f"<em>In {entry['booktitle']}</em>"
-    elif 'publisher' in entry:
-        container = f"<em>{entry['publisher']}</em>"
-        
-    if 'volume' in entry:
-        volume = f", Vol. {entry['volume']}"
-        
-    if 'pages' in entry:
-        pages_val = entry['pages'].replace('--', '–') # Replaces -- with en-dash
-        pages = f", pp. {pages_val}"
+
+    journal = entry.get('journal')
+    booktitle = entry.get('booktitle')
+    publisher = entry.get('publisher')
+    if journal:
+        container = f"<em>{_escape_bib(journal)}</em>"
+    elif booktitle:
+        container = f"<em>In {_escape_bib(booktitle)}</em>"
+    elif publisher:
+        container = f"<em>{_escape_bib(publisher)}</em>"
+
+    volume_val = entry.get('volume')
+    if volume_val:
+        volume = f", Vol. {volume_val}"
+
+    pages_val = entry.get('pages')
+    if pages_val:
+        pages = f", pp. {_escape_bib(pages_val)}" # Also turns -- into an en-dash
         
-    # Building the HTML string
-    html = f"""
-<li>
-<p>{author_str} ({year}).
-<br>
-<a href="{link}" class="external">{title}</a>"""
-    # Now we add all the other links, with their names
-    for a in range(2,31):
-        if 'url_'+str(a) not in entry:
-            break
-        if 'url_note_'+str(a) not in entry:
-            url_note = 'link '+str(a) # Default link text
-        else:
-            url_note = entry['url_note_'+str(a)]
-        html += f" <a href=\"{entry['url_'+str(a)]}\" class=\"external\">[{url_note}]</a>"
-
-    # We add the custom note if present
-    if custom_note:
-        html += f" <strong>{custom_note}</strong>."
-    else:
-        html += "."
-    if container or volume or pages:
-    # Add container, volume and pages
-        html += f" {container}{volume}{pages}."
-    html += "</p>\n</li>"
-    return html
+    # All the other links, with their names
+    # One pass over the fields actually present, instead of probing url_2..url_30:
+    # most entries have no extra urls, so the old loop was 29 dict misses for nothing
+    extra_urls = sorted(
+        (int(key[4:]), key) for key in entry
+        if key.startswith('url_') and key[4:].isdigit()
+    )
+    extra_links = "".join(
+        f" <a href=\"{entry[key]}\" class=\"external\">[{entry.get(f'url_note_{a}', f'link {a}')}]</a>"
+        for a, key in extra_urls
+    )
+
+    # The custom note, if present
+    note_html = f" <strong>{custom_note}</strong>." if custom_note else "."
+    # Container, volume and pages
+    container_html = f" {container}{volume}{pages}." if container or volume or pages else ""
+
+    # Every placeholder value is a local, so locals() is exactly the mapping
+    # _ENTRY_TMPL needs (the extra locals are simply ignored by format_map)
+    return _ENTRY_TMPL.format_map(locals())
 
 def convert_bib_to_html(input_file, output_file):
     """
@@ -135,13 +194,7 @@ def convert_bib_to_html(input_file, output_file):
     print(f"Reading the BibTeX file: {input_file}")
     
     try:
-        # Configure the parser for better character management
-        parser = BibTexParser()
-        parser.customization = convert_to_unicode
-        
-        with open(input_file, 'r', encoding='utf-8') as bibfile:
-            bib_database = bibtexparser.load(bibfile, parser=parser)
-            
+        bib_data = parse_file(input_file, bib_format='bibtex')
     except FileNotFoundError:
         print(f"ERROR: File not found: {input_file}")
         return
@@ -149,49 +202,43 @@ def convert_bib_to_html(input_file, output_file):
         print(f"ERROR while trying to read the BibTeX file: {e}")
         return
 
+    # pybtex keeps fields and authors on its own objects; we flatten each entry
+    # into the plain dict the formatting code expects. Authors are rebuilt as a
+    # single "Surname, Name and Surname, Name ..." string, like in the .bib file
+    entries = []
+    for pb_entry in bib_data.entries.values():
+        entry = {key.lower(): _latex_to_unicode(value) for key, value in pb_entry.fields.items()}
+        authors = pb_entry.persons.get('author')
+        if authors:
+            entry['author'] = ' and '.join(_latex_to_unicode(str(person)) for person in authors)
+        # Author work is done once here, at load time: the formatted HTML string
+        # and the first author's last name for the sort key (taken from pybtex's
+        # already-split name parts, so the author string is never re-parsed)
+        entry['_authors_html'] = get_author_string(entry)
+        entry['_sort_lastname'] = _latex_to_unicode(' '.join(authors[0].last_names)).lower() if authors else ''
+        entries.append(entry)
+
     # 1. Sort entries by year and by first author's last name
+    # Decorate-sort-undecorate: the (year, last name) key is just two dict
+    # lookups on fields precomputed above, no string work in the comparator
     print("Sorting entries by year...")
-    sorted_entries_1 = sorted(
-        bib_database.entries, 
-        key=lambda entry: entry.get('author', '').split(' and ')[0].split(',')[0].split()[-1].lower() # Sort by first author's last name
-    )
-    sorted_entries = sorted(
-        sorted_entries_1, 
-        key=lambda entry: entry.get('year', '') # Sort by year
-    )
-
-    # 2. Generate HTML content
-    html_content = ""
-    for entry in sorted_entries:
-        html_content += format_bibtex_entry(entry)
-
-    # 3. Writes the output in the HTML file
-    full_html = f"""<!DOCTYPE html>
-<html lang="it">
-<head>
-    <meta charset="UTF-8">
-    <title>Converted bibliography</title>
-    <style>
-        /* Minimal styles */
-        li {{
-            margin-bottom: 1em;
-        }}
-        .external {{
-            text-decoration: none;
-        }}
-    </style>
-</head>
-<body>
-    <h1>References</h1>
-    <ul>
-{html_content}
-    </ul>
-</body>
-</html>"""
+    decorated = [
+        ((entry.get('year', ''), entry.get('_sort_lastname', '')), entry)
+        for entry in entries
+    ]
+    decorated.sort(key=lambda t: t[0])
+    sorted_entries = [entry for _, entry in decorated]
 
+    # 2. Writes the output in the HTML file
+    # Entries are streamed straight to the (buffered) file handle, so we never
+    # hold the whole document in memory on top of the final file
     try:
         with open(output_file, 'w', encoding='utf-8') as html_file:
-            html_file.write(full_html)
+            html_file.write(_HTML_HEADER)
+            # writelines consumes the generator lazily: each entry is formatted,
+            # written into the file buffer and discarded, nothing is accumulated
+            html_file.writelines(format_bibtex_entry(entry) for entry in sorted_entries)
+            html_file.write(_HTML_FOOTER)
         print(f"\n✅ Conversion complete! HTML file saved as: {output_file}")
     except Exception as e:
         print(f"ERROR in writing the HTML file: {e}")